@@ -7,6 +7,8 @@ Generated by 'django-admin startproject' using Django 6.0.2.
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -80,10 +82,58 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "TEST": {
+            # File-backed rather than shared-cache in-memory, so threaded tests
+            # (optimistic concurrency) see normal SQLite busy/locking behaviour.
+            "NAME": BASE_DIR / "test_db.sqlite3",
+        },
     }
 }
 
 
+# Cache: local memory by default. With several gunicorn workers set CACHE_DIR
+# so every worker shares one file-based cache (and sees auth invalidations).
+CACHE_DIR = os.environ.get("CACHE_DIR")
+CACHES = {
+    "default": (
+        {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": CACHE_DIR}
+        if CACHE_DIR
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    )
+}
+
+
+# Sessions: "cached_db" (default), "db" or "signed_cookies"
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_MODE = os.environ.get("SESSION_MODE", "cached_db")
+if SESSION_MODE not in SESSION_ENGINES:
+    raise ImproperlyConfigured(
+        f"SESSION_MODE must be one of {', '.join(SESSION_ENGINES)} (got {SESSION_MODE!r})."
+    )
+SESSION_ENGINE = SESSION_ENGINES[SESSION_MODE]
+
+
+# Authentication: ModelBackend that caches the user (with their UserRole) between requests.
+# Logins go through the first backend. The plain ModelBackend stays listed because
+# sessions created before the cached backend store its path, and Django only
+# accepts a session whose backend is still listed; it can be dropped once
+# those sessions have expired (SESSION_COOKIE_AGE, two weeks by default).
+AUTHENTICATION_BACKENDS = [
+    "tickets.backends.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
+# Seconds a cached user stays valid; invalidated early on user/role/password changes.
+# Invalidation only reaches other workers through a shared cache, so without
+# CACHE_DIR the default is short: other workers may see an old role or
+# password (and keep old sessions valid) for up to this long.
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", "300" if CACHE_DIR else "30"))
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -114,6 +164,15 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 # WhiteNoise storage (hashed file names for caching in production)
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
+# Ticket workflow: set TICKET_WORKFLOW to override the default transition table
+# (format documented in tickets/workflow.py)
+
+# Ticket ingestion mode for outages: rate-limited, group-committed ticket_create
+# (other keys and defaults in tickets/ingest.py)
+TICKET_INGEST = {
+    "ENABLED": os.environ.get("TICKET_INGEST", "0") == "1",
+}
+
 # Auth redirects
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "ticket_list"
@@ -1,9 +1,11 @@
 from django.contrib import admin
 
 # Register your models here.
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.http import HttpResponseRedirect
 from .models import (
-    Role, UserRole, Category, Priority, Ticket, Comment, Attachment, StatusHistory
+    Role, UserRole, Category, Priority, Ticket, Comment, Attachment, StatusHistory, StaleTicketError
 )
 
 admin.site.register(Role)
@@ -11,11 +13,47 @@ admin.site.register(UserRole)
 admin.site.register(Category)
 admin.site.register(Priority)
 
+class TicketAdminForm(forms.ModelForm):
+    class Meta:
+        model = Ticket
+        fields = "__all__"
+        # round-trips the version the admin opened, so save_model can detect a conflicting edit
+        widgets = {"version": forms.HiddenInput()}
+
+
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
+    form = TicketAdminForm
     list_display = ("id", "title", "status", "reporter", "assignee", "category", "priority", "created_at")
     list_filter = ("status", "category", "priority")
     search_fields = ("title", "description", "reporter__username", "assignee__username")
+    readonly_fields = ("comment_count",)
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            super().save_model(request, obj, form, change)
+            return
+        try:
+            obj.save_versioned()
+        except StaleTicketError:
+            obj._stale_edit = True
+            self.message_user(
+                request,
+                "This ticket was changed by someone else after you opened it, so your changes were not saved. "
+                "Review the current values and try again.",
+                messages.ERROR,
+            )
+
+    def log_change(self, request, obj, message):
+        if getattr(obj, "_stale_edit", False):
+            return None
+        return super().log_change(request, obj, message)
+
+    def response_change(self, request, obj):
+        if getattr(obj, "_stale_edit", False):
+            # back to the change form, which now shows the current values
+            return HttpResponseRedirect(request.path)
+        return super().response_change(request, obj)
 
 admin.site.register(Comment)
 admin.site.register(Attachment)
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class TicketsConfig(AppConfig):
     name = 'tickets'
+
+    def ready(self):
+        # Auth cache invalidation receivers
+        from . import signals  # noqa: F401
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+UserModel = get_user_model()
+
+
+def user_cache_key(user_id) -> str:
+    return f"tickets:auth-user:{user_id}"
+
+
+def invalidate_cached_users(*user_ids) -> None:
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids])
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose get_user() (run by AuthenticationMiddleware on every
+    request) is served from the cache. The user is cached together with its
+    UserRole and Role, so user_has_role() needs no queries either.
+    Entries are dropped on user/role/password changes (see tickets/signals.py).
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+
+        if user is None:
+            user = (
+                UserModel._default_manager.select_related("user_role__role")
+                .filter(pk=user_id)
+                .first()
+            )
+            if user is None:
+                return None
+            cache.set(key, user, getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 300))
+
+        return user if self.user_can_authenticate(user) else None
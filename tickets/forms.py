@@ -1,6 +1,6 @@
 from django import forms
 from django.contrib.auth import get_user_model
-from .models import Ticket, Category
+from .models import Ticket, Category, Comment
 
 User = get_user_model()
 
@@ -33,3 +33,12 @@ class AssignTechnicianForm(forms.Form):
         tech_qs = kwargs.pop("tech_qs", User.objects.none())
         super().__init__(*args, **kwargs)
         self.fields["technician"].queryset = tech_qs
+
+
+class CommentForm(forms.ModelForm):
+    class Meta:
+        model = Comment
+        fields = ["content"]
+        widgets = {
+            "content": forms.Textarea(attrs={"class": "form-control", "rows": 3}),
+        }
@@ -0,0 +1,261 @@
+"""
+Ingestion mode for ticket_create (settings.TICKET_INGEST["ENABLED"]).
+
+- RateLimiter: per-user and global token buckets in front of ticket creation.
+- GroupCommitWriter: accepted tickets go onto an in-process queue; one
+  background thread flushes them every MAX_DELAY seconds or MAX_BATCH items
+  with bulk_create for Ticket and StatusHistory in a single transaction.
+  Each caller blocks on a Future and still gets its own saved ticket back.
+
+Both are per process: with several gunicorn workers the effective global
+rate is GLOBAL_RATE x workers.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import StatusHistory, Ticket, TicketStatus
+
+
+DEFAULT_INGEST = {
+    "ENABLED": False,
+    # tokens per second and bucket size, per reporter
+    "USER_RATE": 0.5,
+    "USER_BURST": 5,
+    # tokens per second and bucket size, across all reporters
+    "GLOBAL_RATE": 100,
+    "GLOBAL_BURST": 200,
+    # group commit: flush after this many tickets or this many seconds
+    "MAX_BATCH": 100,
+    "MAX_DELAY": 0.005,
+    # seconds a request waits for its ticket to be written
+    "TIMEOUT": 10,
+}
+
+
+class IngestTimeout(Exception):
+    """
+    The ticket was not written within TIMEOUT.
+    withdrawn=True: it was still queued and has been cancelled, so it was not
+    (and will not be) created. withdrawn=False: the writer had already picked
+    it up and did not finish within a further TIMEOUT; it may still be created.
+    """
+
+    def __init__(self, message: str, withdrawn: bool = True):
+        super().__init__(message)
+        self.withdrawn = withdrawn
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def refund(self) -> None:
+        with self.lock:
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    def is_full(self) -> bool:
+        with self.lock:
+            self._refill()
+            return self.tokens >= self.burst
+
+
+class RateLimiter:
+    # Above this many tracked users, idle (full) buckets are dropped
+    MAX_IDLE_BUCKETS = 10000
+
+    def __init__(self, user_rate: float, user_burst: float, global_rate: float, global_burst: float):
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.user_buckets: dict = {}
+        self.lock = threading.Lock()
+
+    def _user_bucket(self, user_id) -> TokenBucket:
+        with self.lock:
+            bucket = self.user_buckets.get(user_id)
+            if bucket is None:
+                if len(self.user_buckets) >= self.MAX_IDLE_BUCKETS:
+                    self.user_buckets = {k: b for k, b in self.user_buckets.items() if not b.is_full()}
+                bucket = self.user_buckets[user_id] = TokenBucket(self.user_rate, self.user_burst)
+            return bucket
+
+    def allow(self, user_id) -> bool:
+        user_bucket = self._user_bucket(user_id)
+        if not user_bucket.try_acquire():
+            return False
+        if not self.global_bucket.try_acquire():
+            # don't charge the user for a request the global limit rejected
+            user_bucket.refund()
+            return False
+        return True
+
+
+class GroupCommitWriter:
+    def __init__(self, max_batch: int = 100, max_delay: float = 0.005):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue: queue.Queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, ticket: Ticket, changed_by) -> Future:
+        """
+        Queues an unsaved ticket (status already initialised). The Future
+        resolves to the saved ticket, with its id set.
+        """
+        self._ensure_started()
+        future: Future = Future()
+        self.queue.put((ticket, changed_by, future))
+        return future
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ticket-group-commit", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.max_delay
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            batch = self._claim(batch)
+            if batch:
+                self._flush(batch)
+
+    def _claim(self, batch) -> list:
+        """
+        Marks the batch's futures as running and drops any whose caller has
+        already given up (cancelled), so a timed-out ticket is never written.
+        """
+        return [item for item in batch if item[2].set_running_or_notify_cancel()]
+
+    def _flush(self, batch) -> None:
+        try:
+            self._write(batch)
+        except Exception:
+            # One bad row must not fail everyone else's ticket: retry one by one.
+            # bulk_create may have set ids before the rollback, so clear them first.
+            for ticket, _, _ in batch:
+                ticket.pk = None
+                ticket._state.adding = True
+
+            for item in batch:
+                try:
+                    self._write([item])
+                except Exception as e:
+                    item[2].set_exception(e)
+                else:
+                    item[2].set_result(item[0])
+            return
+
+        for ticket, _, future in batch:
+            future.set_result(ticket)
+
+    def _write(self, batch) -> None:
+        tickets = [ticket for ticket, _, _ in batch]
+
+        with transaction.atomic():
+            if connection.features.can_return_rows_from_bulk_insert:
+                Ticket.objects.bulk_create(tickets)
+            else:
+                # no RETURNING support: still one transaction (one commit) for the batch
+                for ticket in tickets:
+                    ticket.save()
+
+            StatusHistory.objects.bulk_create([
+                StatusHistory(ticket=ticket, from_status=None, to_status=TicketStatus.NEW, changed_by=changed_by)
+                for ticket, changed_by, _ in batch
+            ])
+
+
+class Ingestor:
+    def __init__(self, config: dict):
+        self.timeout = config["TIMEOUT"]
+        self.limiter = RateLimiter(
+            config["USER_RATE"], config["USER_BURST"], config["GLOBAL_RATE"], config["GLOBAL_BURST"]
+        )
+        self.writer = GroupCommitWriter(config["MAX_BATCH"], config["MAX_DELAY"])
+
+    def create(self, ticket: Ticket, changed_by) -> Ticket:
+        """
+        Blocks until the writer has saved the ticket. Raises IngestTimeout if
+        it was still queued after TIMEOUT seconds; the queued item is cancelled,
+        so a resubmission cannot create a duplicate. If the writer had already
+        claimed it, waits up to another TIMEOUT for the outcome, then raises
+        IngestTimeout(withdrawn=False) rather than blocking the request forever.
+        """
+        future = self.writer.submit(ticket, changed_by)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            if future.cancel():
+                raise IngestTimeout("Ticket was not saved in time.")
+
+        # the writer already claimed it; the write is in progress, so wait for the outcome
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise IngestTimeout("Ticket is still being saved.", withdrawn=False)
+
+
+_ingestor: Ingestor | None = None
+_ingestor_lock = threading.Lock()
+
+
+def get_ingestor() -> Ingestor | None:
+    """
+    Returns the process-wide Ingestor, or None when ingestion mode is off.
+    """
+    global _ingestor
+    config = {**DEFAULT_INGEST, **getattr(settings, "TICKET_INGEST", {})}
+    if not config["ENABLED"]:
+        return None
+
+    with _ingestor_lock:
+        if _ingestor is None:
+            _ingestor = Ingestor(config)
+        return _ingestor
+
+
+def reset_ingestor() -> None:
+    """
+    Drops the process-wide Ingestor; the next get_ingestor() builds it from settings.
+    """
+    global _ingestor
+    with _ingestor_lock:
+        _ingestor = None
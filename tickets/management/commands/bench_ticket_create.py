@@ -0,0 +1,93 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from tickets.ingest import GroupCommitWriter
+from tickets.models import Category, Priority, StatusHistory, Ticket, TicketStatus
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark sustained ticket creates/sec: the per-request transaction path "
+        "vs the group-commit writer. Writes real rows (removed afterwards); "
+        "run it against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16, help="Concurrent submitters.")
+        parser.add_argument("--tickets", type=int, default=100, help="Tickets per thread.")
+        parser.add_argument("--max-batch", type=int, default=100)
+        parser.add_argument("--max-delay", type=float, default=0.005)
+        parser.add_argument("--keep", action="store_true", help="Keep the benchmark tickets.")
+
+    def handle(self, *args, **options):
+        category = Category.objects.filter(is_active=True).first()
+        priority = Priority.objects.first()
+        if category is None or priority is None:
+            raise CommandError("Need at least one active Category and one Priority (load the seed fixture).")
+
+        reporter, _ = User.objects.get_or_create(username="bench-reporter")
+
+        def new_ticket() -> Ticket:
+            ticket = Ticket(title="bench", description="bench", category=category, priority=priority, reporter=reporter)
+            ticket.initialise_status(reporter, TicketStatus.NEW)
+            return ticket
+
+        def direct(ticket: Ticket) -> Ticket:
+            # Same writes as ticket_create without ingestion mode
+            with transaction.atomic():
+                ticket.save()
+                StatusHistory.objects.create(
+                    ticket=ticket, from_status=None, to_status=TicketStatus.NEW, changed_by=reporter
+                )
+            return ticket
+
+        writer = GroupCommitWriter(options["max_batch"], options["max_delay"])
+
+        def grouped(ticket: Ticket) -> Ticket:
+            return writer.submit(ticket, reporter).result(timeout=60)
+
+        created = []
+        for label, create in (("per-request transaction", direct), ("group commit", grouped)):
+            ids, errors, elapsed = self._run(create, new_ticket, options["threads"], options["tickets"])
+            created += ids
+            rate = len(ids) / elapsed if elapsed else 0
+            self.stdout.write(f"{label:<24} {len(ids):6d} created  {errors:5d} errors  {elapsed:7.2f} s  {rate:9.1f} creates/s")
+
+        if not options["keep"]:
+            with transaction.atomic():
+                StatusHistory.objects.filter(ticket_id__in=created).delete()
+                Ticket.objects.filter(id__in=created).delete()
+
+    def _run(self, create, new_ticket, threads: int, per_thread: int):
+        ids, errors = [], []
+        lock = threading.Lock()
+        start_gate = threading.Barrier(threads + 1)
+
+        def worker():
+            mine, failed = [], 0
+            start_gate.wait()
+            for _ in range(per_thread):
+                try:
+                    mine.append(create(new_ticket()).id)
+                except Exception:
+                    failed += 1
+            with lock:
+                ids.extend(mine)
+                errors.append(failed)
+            connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for w in workers:
+            w.start()
+
+        start_gate.wait()
+        start = time.perf_counter()
+        for w in workers:
+            w.join()
+        return ids, sum(errors), time.perf_counter() - start
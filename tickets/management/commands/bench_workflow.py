@@ -0,0 +1,60 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from tickets.models import TicketStatus
+from tickets.workflow import get_workflow, np
+
+
+def legacy_can_transition(status: str, new_status: str) -> bool:
+    # The pre-workflow-engine Ticket.can_transition_to, kept as the baseline
+    allowed = {
+        TicketStatus.NEW: {TicketStatus.OPEN},
+        TicketStatus.OPEN: {TicketStatus.IN_PROGRESS, TicketStatus.CLOSED},
+        TicketStatus.IN_PROGRESS: {TicketStatus.RESOLVED},
+        TicketStatus.RESOLVED: {TicketStatus.CLOSED, TicketStatus.REOPENED},
+        TicketStatus.CLOSED: {TicketStatus.REOPENED},
+        TicketStatus.REOPENED: {TicketStatus.IN_PROGRESS, TicketStatus.RESOLVED},
+    }
+    return new_status in allowed.get(status, set())
+
+
+class Command(BaseCommand):
+    help = "Microbenchmark transition validation: legacy dict vs compiled workflow (scalar and batch)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pairs", type=int, default=100000, help="Number of (from, to) pairs.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def _time(self, label: str, fn, n: int):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"{label:<32} {elapsed * 1000:9.2f} ms  {n / elapsed:14,.0f} pairs/s")
+        return result
+
+    def handle(self, *args, **options):
+        n = options["pairs"]
+        rng = random.Random(options["seed"])
+        statuses = list(TicketStatus.values)
+        from_statuses = [rng.choice(statuses) for _ in range(n)]
+        to_statuses = [rng.choice(statuses) for _ in range(n)]
+
+        workflow = get_workflow()
+        pairs = list(zip(from_statuses, to_statuses))
+
+        legacy = self._time("legacy can_transition_to", lambda: [legacy_can_transition(f, t) for f, t in pairs], n)
+        scalar = self._time("workflow.can_transition", lambda: [workflow.can_transition(f, t) for f, t in pairs], n)
+        batch = self._time("workflow.validate_many (str)", lambda: workflow.validate_many(from_statuses, to_statuses), n)
+
+        if np is not None:
+            # Pre-encoded codes, e.g. columns loaded from a snapshot
+            from_codes = workflow.encode(from_statuses)
+            to_codes = workflow.encode(to_statuses)
+            self._time("workflow.validate_many (codes)", lambda: workflow.validate_many(from_codes, to_codes), n)
+
+        if not (legacy == scalar == [bool(x) for x in batch]):
+            self.stderr.write(self.style.ERROR("Results differ between implementations!"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All implementations agree."))
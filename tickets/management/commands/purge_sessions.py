@@ -0,0 +1,50 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired sessions in small batches with a pause between them, "
+        "so it can run in the background without blocking the app (unlike clearsessions)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Sessions deleted per batch.")
+        parser.add_argument("--sleep", type=float, default=0.1, help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not issubclass(store, DBStore):
+            # signed cookies live in the browser; pure cache sessions expire on their own
+            self.stdout.write("Session engine keeps nothing in the database; nothing to purge.")
+            return
+
+        model = store.get_model_class()
+        now = timezone.now()
+        total = 0
+
+        while True:
+            keys = list(
+                model.objects.filter(expire_date__lt=now).values_list("session_key", flat=True)[:batch_size]
+            )
+            if not keys:
+                break
+
+            # Session has no relations, so this is a single DELETE ... WHERE session_key IN (...)
+            model.objects.filter(session_key__in=keys).delete()
+            total += len(keys)
+
+            if len(keys) < batch_size:
+                break
+            time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} expired sessions."))
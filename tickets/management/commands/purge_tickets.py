@@ -0,0 +1,161 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tickets.models import Attachment, Comment, StatusHistory, Ticket, TicketStatus
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete closed tickets (and their comments, attachments, history and "
+        "attachment files) older than the retention period, in resumable batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=365, help="Retention period for closed tickets.")
+        parser.add_argument("--batch-size", type=int, default=200, help="Tickets deleted per transaction.")
+        parser.add_argument("--sleep", type=float, default=0.2, help="Seconds to pause between batches.")
+        parser.add_argument("--workers", type=int, default=4, help="Threads unlinking attachment files.")
+        parser.add_argument(
+            "--checkpoint",
+            default=str(settings.BASE_DIR / "purge_tickets.checkpoint.json"),
+            help="Progress file; an unfinished purge resumes from it.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted.")
+
+    # ---------- checkpoint ----------
+
+    def _load_checkpoint(self, path: Path):
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_checkpoint(self, path: Path, state: dict) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    # ---------- main ----------
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--batch-size and --workers must be at least 1.")
+
+        checkpoint_path = Path(options["checkpoint"])
+        state = self._load_checkpoint(checkpoint_path)
+
+        if state is not None:
+            cutoff = datetime.fromisoformat(state["cutoff"])
+            self.stdout.write(f"Resuming purge from {checkpoint_path} (cutoff {cutoff:%Y-%m-%d %H:%M}).")
+        else:
+            cutoff = timezone.now() - timedelta(days=options["days"])
+            state = {"cutoff": cutoff.isoformat(), "last_id": 0, "pending_files": [], "deleted": {}}
+
+        scope = Ticket.objects.filter(status=TicketStatus.CLOSED, updated_at__lt=cutoff)
+
+        if options["dry_run"]:
+            self._report({
+                "tickets": scope.count(),
+                "comments": Comment.objects.filter(ticket__in=scope).count(),
+                "attachments": Attachment.objects.filter(ticket__in=scope).count(),
+                "status history": StatusHistory.objects.filter(ticket__in=scope).count(),
+            }, prefix="Would delete")
+            return
+
+        storage = Attachment._meta.get_field("file").storage
+        deleted = state["deleted"]
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            # Files recorded by an interrupted run. They are written ahead of the
+            # delete commit, so skip any whose attachment row survived a rollback.
+            pending = set(state["pending_files"])
+            pending -= set(Attachment.objects.filter(file__in=pending).values_list("file", flat=True))
+            in_flight = {name: pool.submit(storage.delete, name) for name in pending}
+
+            while True:
+                ids = list(
+                    scope.filter(id__gt=state["last_id"]).order_by("id").values_list("id", flat=True)[: options["batch_size"]]
+                )
+                if not ids:
+                    break
+
+                def record_pending(files):
+                    # Write-ahead: checkpoint the batch's files before its deletes commit,
+                    # so a crash right after the commit cannot orphan them.
+                    state["pending_files"] = list(in_flight) + files
+                    self._save_checkpoint(checkpoint_path, state)
+
+                counts, files = self._delete_batch(scope, ids, record_pending)
+                for key, n in counts.items():
+                    deleted[key] = deleted.get(key, 0) + n
+
+                # Unlink after commit, off the main thread; names stay in the
+                # checkpoint until their unlink has finished.
+                for name in files:
+                    in_flight[name] = pool.submit(storage.delete, name)
+                in_flight = self._reap(in_flight)
+
+                state["last_id"] = ids[-1]
+                state["pending_files"] = list(in_flight)
+                self._save_checkpoint(checkpoint_path, state)
+
+                # Throttle so the live app keeps getting the database
+                time.sleep(options["sleep"])
+
+        self._reap(in_flight)
+        checkpoint_path.unlink(missing_ok=True)
+        self._report(deleted, prefix="Deleted")
+
+    def _delete_batch(self, scope, ids, record_pending):
+        """
+        Raw bulk deletes, children first, in one short transaction.
+        Every statement re-applies the retention filter so a ticket reopened
+        since it was selected is left alone. record_pending(files) is called
+        with the attachment file names before the transaction commits.
+        """
+        counts = {}
+        with transaction.atomic():
+            if connection.features.has_select_for_update:
+                list(scope.filter(id__in=ids).select_for_update().values_list("id", flat=True))
+            batch = scope.filter(id__in=ids)
+
+            # _raw_delete issues a single DELETE without loading rows or collecting cascades
+            for label, model in (("status history", StatusHistory), ("comments", Comment)):
+                qs = model.objects.filter(ticket__in=batch)
+                counts[label] = qs._raw_delete(qs.db)
+
+            # On SQLite the deletes above already hold the write lock, so this read is stable
+            attachments = Attachment.objects.filter(ticket__in=batch)
+            files = [name for name in attachments.values_list("file", flat=True) if name]
+            record_pending(files)
+            counts["attachments"] = attachments._raw_delete(attachments.db)
+
+            counts["tickets"] = batch._raw_delete(batch.db)
+
+        return counts, files
+
+    def _reap(self, in_flight: dict) -> dict:
+        """
+        Drops finished unlinks (reporting failures) and returns the rest.
+        """
+        remaining = {}
+        for name, future in in_flight.items():
+            if not future.done():
+                remaining[name] = future
+            elif future.exception() is not None:
+                self.stderr.write(f"Could not delete file {name}: {future.exception()}")
+        return remaining
+
+    def _report(self, counts: dict, prefix: str) -> None:
+        for label in ("tickets", "comments", "attachments", "status history"):
+            self.stdout.write(f"{prefix} {counts.get(label, 0)} {label}")
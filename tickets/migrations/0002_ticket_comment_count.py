@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-10-18 23:16
+
+from django.db import migrations, models
+
+
+def backfill_comment_count(apps, schema_editor):
+    Ticket = apps.get_model("tickets", "Ticket")
+    Comment = apps.get_model("tickets", "Comment")
+
+    counts = (
+        Comment.objects.values("ticket_id")
+        .annotate(n=models.Count("id"))
+        .values_list("ticket_id", "n")
+    )
+    for ticket_id, n in counts:
+        Ticket.objects.filter(pk=ticket_id).update(comment_count=n)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['ticket', 'created_at', 'id'], name='comment_thread_idx'),
+        ),
+        migrations.RunPython(backfill_comment_count, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,30 @@
 from __future__ import annotations
 
+import random
+import time
+
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.utils import timezone
 
 
+# How many times an optimistic ticket update re-reads and retries before giving up
+TICKET_UPDATE_ATTEMPTS = 10
+
+# Seconds; a conflicting update sleeps a random time up to this, doubled per attempt
+TICKET_UPDATE_BACKOFF = 0.005
+TICKET_UPDATE_MAX_BACKOFF = 0.2
+
+
+class StaleTicketError(Exception):
+    """
+    Raised when a ticket was saved by someone else since it was read
+    (its version no longer matches).
+    """
+
+
 class RoleName(models.TextChoices):
     ADMIN = "Admin", "Admin"
     TECHNICIAN = "Technician", "Technician"
@@ -100,21 +119,22 @@ class Ticket(models.Model):
     category = models.ForeignKey(Category, on_delete=models.PROTECT)
     priority = models.ForeignKey(Priority, on_delete=models.PROTECT)
 
+    # denormalised so the detail page never needs a COUNT(*) over comments
+    comment_count = models.PositiveIntegerField(default=0)
+
+    # bumped on every save_versioned(); used for compare-and-swap updates
+    version = models.PositiveIntegerField(default=0)
+
     def __str__(self) -> str:
         return f"#{self.id} {self.title}"
 
     # ---------- Lifecycle rules (matches your state machine) ----------
 
     def can_transition_to(self, new_status: str) -> bool:
-        allowed = {
-            TicketStatus.NEW: {TicketStatus.OPEN},
-            TicketStatus.OPEN: {TicketStatus.IN_PROGRESS, TicketStatus.CLOSED},
-            TicketStatus.IN_PROGRESS: {TicketStatus.RESOLVED},
-            TicketStatus.RESOLVED: {TicketStatus.CLOSED, TicketStatus.REOPENED},
-            TicketStatus.CLOSED: {TicketStatus.REOPENED},
-            TicketStatus.REOPENED: {TicketStatus.IN_PROGRESS, TicketStatus.RESOLVED},
-        }
-        return new_status in allowed.get(self.status, set())
+        # Transition table is configurable and compiled once (see tickets/workflow.py)
+        from .workflow import get_workflow
+
+        return get_workflow().can_transition(self.status, new_status)
 
     def initialise_status(self, changed_by, initial_status: str = TicketStatus.NEW) -> None:
         """
@@ -131,7 +151,8 @@ class Ticket(models.Model):
 
     def assign_technician(self, technician, assigned_by) -> None:
         """
-        Allows assignment/reassignment ONLY while ticket is active:
+        Allows assignment/reassignment ONLY in the workflow's "assignable"
+        statuses. By default:
         - NEW: allowed (usually transitions to OPEN in the view)
         - OPEN: allowed (reassign, status stays OPEN)
         Blocks other states (IN_PROGRESS/RESOLVED/CLOSED/REOPENED).
@@ -139,12 +160,102 @@ class Ticket(models.Model):
         if not user_has_role(technician, RoleName.TECHNICIAN):
             raise ValidationError("Assignee must have Technician role.")
 
-        if self.status not in (TicketStatus.NEW, TicketStatus.OPEN):
+        from .workflow import get_workflow
+
+        if not get_workflow().can_assign(self.status):
             raise ValidationError("Ticket cannot be (re)assigned in its current status.")
 
         self.assignee = technician
         self.assigned_at = timezone.now()
 
+    # ---------- Optimistic concurrency ----------
+
+    def save_versioned(self, update_fields=None) -> None:
+        """
+        Compare-and-swap save: UPDATE ... WHERE id=? AND version=?
+        Raises StaleTicketError if another writer saved first, instead of
+        silently overwriting their change. No row lock is taken.
+        update_fields limits the written fields, as with Model.save().
+        Plain save() is left as Django's; ticket edits (views, TicketAdmin)
+        go through here.
+        """
+        if self.pk is None:
+            raise ValidationError("save_versioned can only be used on saved tickets.")
+
+        fields = self._meta.concrete_fields
+        if update_fields is not None:
+            fields = [self._meta.get_field(name) for name in update_fields]
+
+        # comment_count is maintained separately with F() updates, so never write it back
+        values = {
+            f.attname: getattr(self, f.attname)
+            for f in fields
+            if not f.primary_key and f.attname not in ("version", "comment_count")
+        }
+        values["updated_at"] = timezone.now()  # auto_now is not applied by update()
+
+        updated = Ticket.objects.filter(pk=self.pk, version=self.version).update(
+            version=F("version") + 1, **values
+        )
+        if not updated:
+            raise StaleTicketError(f"Ticket #{self.pk} was changed by someone else.")
+
+        self.version += 1
+        self.updated_at = values["updated_at"]
+
+    @classmethod
+    def update_with_retry(cls, ticket_id: int, mutate, changed_by, attempts: int = TICKET_UPDATE_ATTEMPTS) -> "Ticket":
+        """
+        Optimistic read-modify-write loop used by the views.
+        - mutate(ticket) applies the change in memory (e.g. assign_technician,
+          change_status). A ValidationError from it aborts without retrying.
+        - On a version conflict the ticket is re-read and mutate runs again
+          against the fresh state, so rules are re-checked every attempt.
+        - A status change is written to StatusHistory in the same transaction
+          as the winning update, so a transition is only ever recorded once.
+        - Between attempts it sleeps a random, exponentially growing delay
+          (full jitter), so writers that collided don't collide again in lockstep.
+        """
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(random.uniform(0, min(TICKET_UPDATE_MAX_BACKOFF, TICKET_UPDATE_BACKOFF * 2 ** attempt)))
+
+            ticket = cls.objects.get(pk=ticket_id)
+            from_status = ticket.status
+            mutate(ticket)
+
+            try:
+                with transaction.atomic():
+                    ticket.save_versioned()
+                    if ticket.status != from_status:
+                        StatusHistory.objects.create(
+                            ticket=ticket,
+                            from_status=from_status,
+                            to_status=ticket.status,
+                            changed_by=changed_by,
+                        )
+            except StaleTicketError:
+                continue
+
+            return ticket
+
+        raise StaleTicketError(f"Ticket #{ticket_id} is being updated by others; please try again.")
+
+    def add_comment(self, author, content: str) -> "Comment":
+        """
+        Adds a comment. comment_count (and updated_at, so incremental snapshots
+        pick up the new count) is bumped in the database by the Comment
+        post_save handler in tickets/signals.py; this keeps the instance in step.
+        Call inside transaction.atomic() so both writes commit together.
+        """
+        if self.pk is None:
+            raise ValidationError("Cannot comment on an unsaved ticket.")
+
+        comment = Comment.objects.create(ticket=self, author=author, content=content)
+        self.comment_count += 1
+        self.updated_at = timezone.now()
+        return comment
+
 
 class Comment(models.Model):
     ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name="comments")
@@ -152,6 +263,12 @@ class Comment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        # matches the (created_at, id) cursor used by the comment thread pages
+        indexes = [
+            models.Index(fields=["ticket", "created_at", "id"], name="comment_thread_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"Comment {self.id} on Ticket {self.ticket_id}"
 
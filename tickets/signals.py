@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.core.signals import setting_changed
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .backends import invalidate_cached_users
+from .ingest import reset_ingestor
+from .models import Comment, Role, Ticket, UserRole
+from .workflow import reset_workflow
+
+User = get_user_model()
+
+
+# Password changes are user saves, so they are covered here too
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    invalidate_cached_users(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+def invalidate_user_role(sender, instance, **kwargs):
+    invalidate_cached_users(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Role)
+def invalidate_role(sender, instance, **kwargs):
+    invalidate_cached_users(*UserRole.objects.filter(role=instance).values_list("user_id", flat=True))
+
+
+# Ticket.comment_count follows every comment create/delete (views, admin, shell),
+# with single F() UPDATEs so concurrent writers never lose a change.
+# updated_at moves too, so incremental snapshots pick up the new count.
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    if created:
+        Ticket.objects.filter(pk=instance.ticket_id).update(
+            comment_count=F("comment_count") + 1, updated_at=timezone.now()
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, origin=None, **kwargs):
+    # comments cascading from a ticket delete: the ticket row is going away too
+    if isinstance(origin, Ticket) or getattr(origin, "model", None) is Ticket:
+        return
+    Ticket.objects.filter(pk=instance.ticket_id).update(
+        comment_count=F("comment_count") - 1, updated_at=timezone.now()
+    )
+
+
+# Objects built once from a setting, rebuilt when override_settings() changes it
+SETTING_RESETS = {
+    "TICKET_WORKFLOW": reset_workflow,
+    "TICKET_INGEST": reset_ingestor,
+}
+
+
+@receiver(setting_changed)
+def reset_setting_caches(sender, setting, **kwargs):
+    reset = SETTING_RESETS.get(setting)
+    if reset is not None:
+        reset()
@@ -0,0 +1,442 @@
+"""
+Columnar snapshot export for offline analytics (used by `snapshot_tickets`).
+
+Layout under the output directory:
+    manifest.json                  format, dictionaries, watermarks and parts per table
+    <table>/part-00000.arrow       Arrow IPC file (when pyarrow is installed)
+    <table>/part-00000/<col>.npy   one NumPy array per column (fallback)
+    <table>/deleted-00000[.arrow]  ids deleted since earlier parts (single "id" column)
+
+A full run writes part-00000 for every table. An incremental run appends the
+next part with only the rows changed since the previous run's watermark, so a
+ticket can appear in several parts: keep the row from the latest part per id.
+Rows deleted since they were exported (e.g. by purge_tickets) never show up
+in a new part, so an incremental run also writes a deleted-NNNNN part with
+their ids: drop every id in deleted_ids() before counting. Ids are never
+reused, so a deleted id stays deleted.
+
+status, category and priority are dictionary-encoded as small integer codes;
+the dictionaries are stored in the manifest. Missing values are nulls in Arrow
+and -1 (or NaT for datetimes) in NumPy.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+from pathlib import Path
+
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from .models import Category, Comment, Priority, StatusHistory, Ticket, TicketStatus
+
+# Optional dependencies: pyarrow is preferred, NumPy .npy files are the fallback
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+MANIFEST_NAME = "manifest.json"
+
+STATUS_CODES = {status: code for code, status in enumerate(TicketStatus.values)}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# Incremental ticket runs re-read rows updated this long before the previous run started
+UPDATED_AT_MARGIN = timedelta(minutes=5)
+
+
+# Each column: (output name, values_list source, kind).
+# Kinds: int64, int32, int8, bool, datetime, status (int8 code), str<N> (max length N).
+TABLES = {
+    "ticket": {
+        "queryset": lambda: Ticket.objects.all(),
+        "columns": [
+            ("id", "id", "int64"),
+            ("title", "title", "str120"),
+            ("status", "status", "status"),
+            ("category", "category_id", "int32"),
+            ("priority", "priority_id", "int32"),
+            ("reporter_id", "reporter_id", "int32"),
+            ("assignee_id", "assignee_id", "int32"),
+            ("created_at", "created_at", "datetime"),
+            ("updated_at", "updated_at", "datetime"),
+            ("assigned_at", "assigned_at", "datetime"),
+            ("comment_count", "comment_count", "int32"),
+            ("version", "version", "int32"),
+        ],
+        # tickets are updated in place (comments bump updated_at too), so select on updated_at
+        "watermark": "updated_at",
+    },
+    "status_history": {
+        "queryset": lambda: StatusHistory.objects.all(),
+        "columns": [
+            ("id", "id", "int64"),
+            ("ticket_id", "ticket_id", "int64"),
+            ("from_status", "from_status", "status"),
+            ("to_status", "to_status", "status"),
+            ("changed_by_id", "changed_by_id", "int32"),
+            ("changed_at", "changed_at", "datetime"),
+        ],
+        # append-only with a single SQLite writer, so ids commit in order
+        "watermark": "id",
+    },
+    "comment": {
+        # metadata only; the comment body never leaves the database
+        "queryset": lambda: Comment.objects.annotate(content_length=Length("content")),
+        "columns": [
+            ("id", "id", "int64"),
+            ("ticket_id", "ticket_id", "int64"),
+            ("author_id", "author_id", "int32"),
+            ("created_at", "created_at", "datetime"),
+            ("content_length", "content_length", "int32"),
+        ],
+        "watermark": "id",
+    },
+    # reference tables are small and rewritten in full on every run
+    "category": {
+        "queryset": lambda: Category.objects.all(),
+        "columns": [
+            ("id", "id", "int32"),
+            ("name", "name", "str80"),
+            ("is_active", "is_active", "bool"),
+        ],
+        "watermark": None,
+    },
+    "priority": {
+        "queryset": lambda: Priority.objects.all(),
+        "columns": [
+            ("id", "id", "int32"),
+            ("name", "name", "str20"),
+            ("rank", "rank", "int32"),
+        ],
+        "watermark": None,
+    },
+}
+
+
+# Column spec of the deleted-NNNNN parts
+DELETED_COLUMNS = [("id", "id", "int64")]
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def available_format(requested: str = "auto") -> str:
+    if requested in ("auto", "arrow") and pa is not None:
+        return "arrow"
+    if requested in ("auto", "npy") and np is not None:
+        return "npy"
+    if requested == "auto":
+        raise SnapshotError("Snapshots need pyarrow or numpy installed.")
+    raise SnapshotError(f"Format '{requested}' needs {'pyarrow' if requested == 'arrow' else 'numpy'} installed.")
+
+
+# ---------- value conversion ----------
+
+def _datetime_micros(value):
+    if value is None:
+        return None
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _npy_column(values, kind: str):
+    if kind == "status":
+        return np.array([STATUS_CODES.get(v, -1) for v in values], dtype=np.int8)
+    if kind == "datetime":
+        # NaT is the int64 minimum
+        micros = [_datetime_micros(v) for v in values]
+        nat = np.iinfo(np.int64).min
+        return np.array([nat if m is None else m for m in micros], dtype=np.int64).view("datetime64[us]")
+    if kind == "bool":
+        return np.array(values, dtype=np.bool_)
+    if kind.startswith("str"):
+        return np.array(["" if v is None else v for v in values], dtype=f"<U{kind[3:]}")
+    return np.array([-1 if v is None else v for v in values], dtype=kind)
+
+
+def _arrow_type(kind: str):
+    if kind == "status":
+        return pa.int8()
+    if kind == "datetime":
+        return pa.timestamp("us", tz="UTC")
+    if kind == "bool":
+        return pa.bool_()
+    if kind.startswith("str"):
+        return pa.string()
+    return getattr(pa, kind)()
+
+
+def _arrow_column(values, kind: str):
+    if kind == "status":
+        values = [STATUS_CODES.get(v) for v in values]
+    return pa.array(values, type=_arrow_type(kind))
+
+
+# ---------- part writers ----------
+
+class _NpyPartWriter:
+    """
+    Streams each column into a raw file, then prefixes the .npy header once
+    the final length is known, so memory stays bounded by one chunk.
+    """
+
+    suffix = ""
+
+    def __init__(self, path: Path, columns):
+        path.mkdir(parents=True)
+        self.path = path
+        self.columns = columns
+        self.rows = 0
+        self.raw = {name: open(path / f"{name}.raw", "wb") for name, _, _ in columns}
+
+    def write_chunk(self, data: dict) -> None:
+        for name, _, kind in self.columns:
+            _npy_column(data[name], kind).tofile(self.raw[name])
+        self.rows += len(data[self.columns[0][0]])
+
+    def close(self) -> None:
+        for name, _, kind in self.columns:
+            self.raw[name].close()
+            # every kind has a fixed dtype (strings use the model's max_length)
+            dtype = _npy_column([], kind).dtype
+            raw_path = self.path / f"{name}.raw"
+
+            with open(self.path / f"{name}.npy", "wb") as out, open(raw_path, "rb") as src:
+                header = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (self.rows,)}
+                np.lib.format.write_array_header_1_0(out, header)
+                shutil.copyfileobj(src, out)
+            raw_path.unlink()
+
+
+class _ArrowPartWriter:
+    suffix = ".arrow"
+
+    def __init__(self, path: Path, columns):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.columns = columns
+        self.rows = 0
+        self.schema = pa.schema([(name, _arrow_type(kind)) for name, _, kind in columns])
+        self.writer = pa.ipc.new_file(str(path), self.schema)
+
+    def write_chunk(self, data: dict) -> None:
+        arrays = [_arrow_column(data[name], kind) for name, _, kind in self.columns]
+        self.writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+        self.rows += len(data[self.columns[0][0]])
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+_WRITERS = {"arrow": _ArrowPartWriter, "npy": _NpyPartWriter}
+
+
+def _part_path(output_dir: Path, table: str, part: str, fmt: str) -> Path:
+    return output_dir / table / (part + _WRITERS[fmt].suffix)
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+# ---------- export / load ----------
+
+def read_manifest(output_dir) -> dict | None:
+    path = Path(output_dir) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(output_dir: Path, manifest: dict) -> None:
+    # write-then-rename so readers never see a half-written manifest
+    tmp = output_dir / (MANIFEST_NAME + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, output_dir / MANIFEST_NAME)
+
+
+def _export_table(output_dir: Path, table: str, spec: dict, part: str, fmt: str, since, chunk_size: int):
+    """
+    Streams one table into a new part. Returns (rows written, new watermark).
+    """
+    qs = spec["queryset"]()
+    watermark = spec["watermark"]
+    newest = None
+    if since is not None:
+        if watermark == "updated_at":
+            qs = qs.filter(updated_at__gte=datetime.fromisoformat(since))
+        else:
+            newest = since
+            qs = qs.filter(id__gt=since)
+
+    if watermark == "updated_at":
+        # Taken from the clock before the scan, not from the rows: a ticket saved
+        # just before the scan may commit after it with an older updated_at.
+        # The margin covers transactions shorter than UPDATED_AT_MARGIN.
+        newest = (timezone.now() - UPDATED_AT_MARGIN).isoformat()
+
+    columns = spec["columns"]
+    names = [name for name, _, _ in columns]
+    rows = qs.order_by("id").values_list(*[source for _, source, _ in columns]).iterator(chunk_size=chunk_size)
+
+    # an interrupted incremental run can leave this part behind, unlisted in the manifest
+    path = _part_path(output_dir, table, part, fmt)
+    _remove(path)
+    writer = _WRITERS[fmt](path, columns)
+    try:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            data = dict(zip(names, zip(*chunk)))
+            writer.write_chunk(data)
+
+            if watermark == "id":
+                chunk_max = max(data["id"])
+                newest = chunk_max if newest is None else max(newest, chunk_max)
+    finally:
+        writer.close()
+
+    return writer.rows, newest
+
+
+def _read_ids(path: Path, fmt: str) -> list:
+    if fmt == "arrow":
+        return pa.ipc.open_file(pa.memory_map(str(path))).read_all().column("id").to_pylist()
+    return np.load(path / "id.npy", mmap_mode="r").tolist()
+
+
+def _export_deleted(output_dir: Path, table: str, spec: dict, state: dict, fmt: str, chunk_size: int):
+    """
+    Writes the ids exported in earlier parts that are no longer in the
+    database to a new deleted part. Returns the part name, or None if nothing
+    was deleted.
+    """
+    exported = set()
+    for part in state["parts"]:
+        exported.update(_read_ids(_part_path(output_dir, table, part, fmt), fmt))
+    for part in state.get("deleted", []):
+        exported.difference_update(_read_ids(_part_path(output_dir, table, part, fmt), fmt))
+
+    exported.difference_update(spec["queryset"]().values_list("id", flat=True).iterator(chunk_size=chunk_size))
+    if not exported:
+        return None
+
+    part = f"deleted-{len(state.get('deleted', [])):05d}"
+    path = _part_path(output_dir, table, part, fmt)
+    _remove(path)
+    writer = _WRITERS[fmt](path, DELETED_COLUMNS)
+    try:
+        writer.write_chunk({"id": sorted(exported)})
+    finally:
+        writer.close()
+    return part
+
+
+def export_snapshot(output_dir, fmt: str = "auto", chunk_size: int = 10000, incremental: bool = False) -> dict:
+    """
+    Writes a snapshot (or an incremental part) and returns {table: rows written}.
+    """
+    output_dir = Path(output_dir)
+    manifest = read_manifest(output_dir) if incremental else None
+
+    if incremental and manifest is None:
+        raise SnapshotError(f"No previous snapshot in {output_dir}; run a full snapshot first.")
+    if manifest is not None:
+        if fmt not in ("auto", manifest["format"]):
+            raise SnapshotError(f"Existing snapshot is '{manifest['format']}', not '{fmt}'.")
+        fmt = manifest["format"]
+    else:
+        fmt = available_format(fmt)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {"format": fmt, "tables": {}}
+
+    written = {}
+    for table, spec in TABLES.items():
+        state = manifest["tables"].get(table) if incremental else None
+        appending = state is not None and spec["watermark"] is not None
+
+        if appending:
+            # a None watermark means nothing was exported yet, so everything is new
+            parts, since = state["parts"], state["watermark"]
+            deleted = state.get("deleted", [])
+            deleted_part = _export_deleted(output_dir, table, spec, state, fmt, chunk_size)
+            if deleted_part is not None:
+                deleted = deleted + [deleted_part]
+        else:
+            # full rewrite of this table
+            _remove(output_dir / table)
+            parts, since, deleted = [], None, []
+
+        part = f"part-{len(parts):05d}"
+        rows, new_watermark = _export_table(output_dir, table, spec, part, fmt, since, chunk_size)
+        if rows or not appending:
+            parts = parts + [part]
+        else:
+            _remove(_part_path(output_dir, table, part, fmt))
+
+        manifest["tables"][table] = {"parts": parts, "watermark": new_watermark, "deleted": deleted}
+        written[table] = rows
+
+    manifest["dictionaries"] = {
+        "status": list(TicketStatus.values),
+        "category": {str(pk): name for pk, name in Category.objects.values_list("id", "name")},
+        "priority": {str(pk): name for pk, name in Priority.objects.values_list("id", "name")},
+    }
+    manifest["created_at"] = datetime.now(dt_timezone.utc).isoformat()
+    _write_manifest(output_dir, manifest)
+    return written
+
+
+def load_table(output_dir, table: str):
+    """
+    Memory-maps every part of a table.
+    Arrow: one pyarrow.Table (parts are concatenated without copying).
+    NumPy: a list of {column: memmap array} dicts, one per part.
+    """
+    output_dir = Path(output_dir)
+    manifest = read_manifest(output_dir)
+    if manifest is None:
+        raise SnapshotError(f"No snapshot in {output_dir}.")
+
+    fmt = manifest["format"]
+    paths = [_part_path(output_dir, table, part, fmt) for part in manifest["tables"][table]["parts"]]
+
+    if fmt == "arrow":
+        return pa.concat_tables([pa.ipc.open_file(pa.memory_map(str(p))).read_all() for p in paths])
+
+    columns = [name for name, _, _ in TABLES[table]["columns"]]
+    return [{name: np.load(p / f"{name}.npy", mmap_mode="r") for name in columns} for p in paths]
+
+
+def deleted_ids(output_dir, table: str) -> set:
+    """
+    Ids of rows in load_table()'s parts that have since been deleted.
+    """
+    output_dir = Path(output_dir)
+    manifest = read_manifest(output_dir)
+    if manifest is None:
+        raise SnapshotError(f"No snapshot in {output_dir}.")
+
+    fmt = manifest["format"]
+    ids = set()
+    for part in manifest["tables"][table].get("deleted", []):
+        ids.update(_read_ids(_part_path(output_dir, table, part, fmt), fmt))
+    return ids
@@ -1,13 +1,54 @@
 from django.test import TestCase
 
 # Create your tests here.
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.sessions.models import Session
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import IntegrityError, connection
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from .models import Role, UserRole, RoleName, Category, Priority, Ticket, TicketStatus
+from django.urls import reverse
+from django.utils import timezone
+from unittest import mock
+from .models import (
+    user_has_role, Role, UserRole, RoleName, Category, Priority, Ticket, TicketStatus, Comment, StatusHistory,
+    Attachment,
+    StaleTicketError,
+)
+from . import snapshot
+from .workflow import get_workflow
+from .backends import CachedModelBackend
+from .ingest import IngestTimeout, Ingestor, DEFAULT_INGEST, RateLimiter
 
 User = get_user_model()
 
+
+class TicketFixtureMixin:
+    """
+    A reporter (rep1) plus an active category and a priority to file tickets under.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.rep = User.objects.create_user(username="rep1", password="pass")
+        self.cat = Category.objects.create(name="IT", is_active=True)
+        self.pri = Priority.objects.create(name="High", rank=3)
+
+    def _new_ticket(self, **fields):
+        fields = {"title": "A", "description": "B", **fields}
+        return Ticket.objects.create(category=self.cat, priority=self.pri, reporter=self.rep, **fields)
+
 class TicketWorkflowTests(TestCase):
     def setUp(self):
         self.role_admin = Role.objects.create(role_name=RoleName.ADMIN)
@@ -43,3 +84,514 @@ class TicketWorkflowTests(TestCase):
         t.assign_technician(self.tech, self.admin)
         self.assertEqual(t.assignee, self.tech)
         self.assertIsNotNone(t.assigned_at)
+
+
+class TicketCommentTests(TicketFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.ticket = self._new_ticket()
+        self.client.force_login(self.rep)
+
+    def test_post_comment_updates_counter(self):
+        url = reverse("ticket_comments", args=[self.ticket.id])
+        self.client.post(url, {"content": "first"})
+        self.client.post(url, {"content": "second"})
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.comment_count, 2)
+        self.assertEqual(Comment.objects.filter(ticket=self.ticket).count(), 2)
+
+    def test_counter_follows_direct_creates_and_deletes(self):
+        # e.g. comments added or removed through the admin
+        comments = [Comment.objects.create(ticket=self.ticket, author=self.rep, content=str(i)) for i in range(3)]
+        comments[0].delete()
+        Comment.objects.filter(pk=comments[1].pk).delete()
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.comment_count, 1)
+
+        self.ticket.delete()
+        self.assertFalse(Comment.objects.exists())
+
+    def test_cursor_pages_cover_thread_in_order(self):
+        # Same timestamp for every comment forces the id tie-breaker
+        now = timezone.now()
+        ids = [
+            Comment.objects.create(ticket=self.ticket, author=self.rep, content=str(i), created_at=now).id
+            for i in range(5)
+        ]
+
+        url = reverse("ticket_comments", args=[self.ticket.id])
+        seen, cursor, pages = [], "", 0
+        with mock.patch("tickets.views.COMMENTS_PAGE_SIZE", 2):
+            while True:
+                page = self.client.get(url, {"cursor": cursor}).json()
+                pages += 1
+                self.assertLessEqual(len(page["comments"]), 2)
+                seen += [c["id"] for c in page["comments"]]
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, ids)
+
+    def test_bad_cursor_is_rejected(self):
+        url = reverse("ticket_comments", args=[self.ticket.id])
+        self.assertEqual(self.client.get(url, {"cursor": "nope"}).status_code, 400)
+
+
+class TicketConcurrencyTests(TicketFixtureMixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ticket = self._new_ticket(description="")
+
+    def test_stale_save_is_rejected(self):
+        first = Ticket.objects.get(pk=self.ticket.pk)
+        second = Ticket.objects.get(pk=self.ticket.pk)
+
+        first.title = "first"
+        first.save_versioned()
+
+        second.title = "second"
+        with self.assertRaises(StaleTicketError):
+            second.save_versioned()
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.title, "first")
+        self.assertEqual(self.ticket.version, 1)
+
+    def test_stale_admin_edit_shows_error(self):
+        admin_user = User.objects.create_superuser(username="root", password="pass")
+        self.client.force_login(admin_user)
+        url = reverse("admin:tickets_ticket_change", args=[self.ticket.pk])
+
+        # the admin opens the form (at version 0), then someone else saves the ticket
+        data = {
+            "title": "mine",
+            "description": "B",
+            "status": self.ticket.status,
+            "created_at_0": self.ticket.created_at.strftime("%Y-%m-%d"),
+            "created_at_1": self.ticket.created_at.strftime("%H:%M:%S"),
+            "reporter": self.rep.pk,
+            "category": self.ticket.category_id,
+            "priority": self.ticket.priority_id,
+            "version": 0,
+        }
+        Ticket.update_with_retry(self.ticket.pk, lambda t: setattr(t, "title", "theirs"), self.rep)
+
+        response = self.client.post(url, data, follow=True)
+        self.assertContains(response, "changed by someone else")
+        self.ticket.refresh_from_db()
+        self.assertEqual((self.ticket.title, self.ticket.version), ("theirs", 1))
+
+        # resubmitting from the current version goes through
+        data["version"] = 1
+        self.client.post(url, data)
+        self.ticket.refresh_from_db()
+        self.assertEqual((self.ticket.title, self.ticket.version), ("mine", 2))
+
+        # plain save() keeps Django's semantics: no version bump, no write for update_fields=[]
+        self.ticket.save(update_fields=[])
+        self.assertEqual(Ticket.objects.get(pk=self.ticket.pk).version, 2)
+
+    def test_concurrent_updates_lose_nothing(self):
+        workers, per_worker = 8, 10
+        errors = []
+
+        def append(t: Ticket) -> None:
+            t.description += "x"
+
+        def run():
+            try:
+                for _ in range(per_worker):
+                    Ticket.update_with_retry(self.ticket.pk, append, self.rep)
+            except Exception as e:  # surfaced in the assertion below
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run) for _ in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.ticket.refresh_from_db()
+        self.assertEqual(len(self.ticket.description), workers * per_worker)
+        self.assertEqual(self.ticket.version, workers * per_worker)
+
+    def test_first_assignment_recorded_once(self):
+        tech = User.objects.create_user(username="tech1", password="pass")
+        UserRole.objects.create(user=tech, role=Role.objects.create(role_name=RoleName.TECHNICIAN))
+
+        def assign(t: Ticket) -> None:
+            t.assign_technician(tech, self.rep)
+            if t.status == TicketStatus.NEW:
+                t.change_status(TicketStatus.OPEN, self.rep)
+
+        # Both admins read the ticket while it was still NEW
+        stale = Ticket.objects.get(pk=self.ticket.pk)
+        Ticket.update_with_retry(self.ticket.pk, assign, self.rep)
+        assign(stale)
+        with self.assertRaises(StaleTicketError):
+            stale.save_versioned()
+
+        # The retrying path re-reads OPEN and only reassigns
+        Ticket.update_with_retry(self.ticket.pk, assign, self.rep)
+        self.assertEqual(
+            StatusHistory.objects.filter(ticket=self.ticket, to_status=TicketStatus.OPEN).count(), 1
+        )
+
+
+class SnapshotTests(TicketFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.ticket = self._new_ticket()
+        self.ticket.add_comment(self.rep, "hello")
+
+    def _snapshot(self, out, fmt, *extra):
+        call_command("snapshot_tickets", out, "--format", fmt, "--chunk-size", "1", *extra, stdout=StringIO())
+
+    @mock.patch.object(snapshot, "pa", None)
+    def test_npy_full_then_incremental(self):
+        if snapshot.np is None:
+            self.skipTest("numpy not installed")
+
+        with tempfile.TemporaryDirectory() as out:
+            self._snapshot(out, "npy")
+            self._new_ticket(title="C", description="D")
+            self._snapshot(out, "npy", "--incremental")
+
+            parts = snapshot.load_table(out, "ticket")
+            ids = [int(i) for part in parts for i in part["id"]]
+            self.assertEqual(len(parts), 2)
+            # boundary row is re-exported (>= watermark), newest ticket is in the new part
+            self.assertIn(Ticket.objects.latest("id").id, [int(i) for i in parts[1]["id"]])
+            self.assertEqual(set(ids), set(Ticket.objects.values_list("id", flat=True)))
+
+            comments = snapshot.load_table(out, "comment")
+            self.assertEqual(int(comments[0]["content_length"][0]), len("hello"))
+            self.assertEqual(
+                int(parts[0]["status"][0]), snapshot.STATUS_CODES[TicketStatus.NEW]
+            )
+
+    @mock.patch.object(snapshot, "pa", None)
+    def test_incremental_picks_up_comments_and_replaces_stale_part(self):
+        if snapshot.np is None:
+            self.skipTest("numpy not installed")
+
+        with tempfile.TemporaryDirectory() as out:
+            # watermark taken with no margin, and already past the existing rows
+            with mock.patch.object(snapshot, "UPDATED_AT_MARGIN", timedelta(0)):
+                self._snapshot(out, "npy")
+
+            # left behind by an interrupted incremental run, not in the manifest
+            stale = os.path.join(out, "ticket", "part-00001")
+            os.makedirs(stale)
+            open(os.path.join(stale, "id.npy"), "w").close()
+
+            self.ticket.add_comment(self.rep, "again")
+            self._snapshot(out, "npy", "--incremental")
+
+            parts = snapshot.load_table(out, "ticket")
+            self.assertEqual([int(i) for i in parts[1]["id"]], [self.ticket.id])
+            self.assertEqual(int(parts[1]["comment_count"][0]), 2)
+
+    @mock.patch.object(snapshot, "pa", None)
+    def test_incremental_records_deleted_rows(self):
+        if snapshot.np is None:
+            self.skipTest("numpy not installed")
+
+        with tempfile.TemporaryDirectory() as out:
+            self._snapshot(out, "npy")
+            ticket_id, comment_id = self.ticket.id, Comment.objects.get().id
+            self.ticket.delete()  # e.g. purge_tickets
+
+            self._snapshot(out, "npy", "--incremental")
+            self.assertEqual(snapshot.deleted_ids(out, "ticket"), {ticket_id})
+            self.assertEqual(snapshot.deleted_ids(out, "comment"), {comment_id})
+
+            # already recorded, so the next run adds no deleted part
+            self._snapshot(out, "npy", "--incremental")
+            self.assertEqual(snapshot.read_manifest(out)["tables"]["ticket"]["deleted"], ["deleted-00000"])
+
+    def test_arrow_snapshot_loads_memory_mapped(self):
+        if snapshot.pa is None:
+            self.skipTest("pyarrow not installed")
+
+        with tempfile.TemporaryDirectory() as out:
+            self._snapshot(out, "arrow")
+            table = snapshot.load_table(out, "ticket")
+            self.assertEqual(table.column("id").to_pylist(), [self.ticket.id])
+            self.assertEqual(snapshot.read_manifest(out)["dictionaries"]["category"], {str(self.cat.id): "IT"})
+
+
+class WorkflowTests(TestCase):
+    def test_default_table_and_batch_agree(self):
+        wf = get_workflow()
+        statuses = list(TicketStatus.values)
+        pairs = [(f, t) for f in statuses for t in statuses]
+
+        batch = wf.validate_many([f for f, _ in pairs], [t for _, t in pairs])
+        self.assertEqual([bool(x) for x in batch], [wf.can_transition(f, t) for f, t in pairs])
+        self.assertEqual(wf.allowed_targets(TicketStatus.OPEN), (TicketStatus.IN_PROGRESS, TicketStatus.CLOSED))
+        self.assertFalse(wf.can_transition(TicketStatus.IN_PROGRESS, TicketStatus.CLOSED))
+        self.assertEqual([bool(x) for x in wf.validate_many(["bogus"], [TicketStatus.OPEN])], [False])
+
+    def test_plain_integer_codes(self):
+        wf = get_workflow()
+        new, open_, closed = (wf.index[s] for s in (TicketStatus.NEW, TicketStatus.OPEN, TicketStatus.CLOSED))
+        expected = [True, False, False]
+
+        # NEW -> OPEN, NEW -> CLOSED, out-of-range code
+        from_codes, to_codes = [new, new, 99], [open_, closed, open_]
+        self.assertEqual([bool(x) for x in wf.validate_many(from_codes, to_codes)], expected)
+        with mock.patch("tickets.workflow.np", None):
+            self.assertEqual(wf.validate_many(from_codes, to_codes), expected)
+        self.assertTrue(wf.can_transition(new, open_))
+
+    @override_settings(TICKET_WORKFLOW={
+        "transitions": {TicketStatus.IN_PROGRESS: [TicketStatus.CLOSED]},
+        "assignable": [TicketStatus.IN_PROGRESS],
+    })
+    def test_configured_workflow_drives_ticket_rules(self):
+        t = Ticket(status=TicketStatus.IN_PROGRESS)
+        self.assertTrue(t.can_transition_to(TicketStatus.CLOSED))
+        self.assertFalse(t.can_transition_to(TicketStatus.RESOLVED))
+        self.assertTrue(get_workflow().can_assign(TicketStatus.IN_PROGRESS))
+        self.assertFalse(get_workflow().can_assign(TicketStatus.NEW))
+
+
+class AuthCacheTests(TicketFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.role_tech = Role.objects.create(role_name=RoleName.TECHNICIAN)
+        self.role_admin = Role.objects.create(role_name=RoleName.ADMIN)
+        self.tech = User.objects.create_user(username="tech1", password="pass")
+        UserRole.objects.create(user=self.tech, role=self.role_tech)
+        self.backend = CachedModelBackend()
+
+    def test_warm_request_has_no_auth_queries(self):
+        url = reverse("ticket_detail", args=[self._new_ticket().id])
+        self.client.force_login(self.tech)
+        self.client.get(url)  # warms the session and user caches
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["user"], self.tech)
+        for table in ("django_session", "auth_user", "tickets_userrole", "tickets_role"):
+            self.assertEqual([q["sql"] for q in queries if f'FROM "{table}"' in q["sql"]], [])
+
+    def test_sessions_from_plain_model_backend_stay_valid(self):
+        # logged in before CachedModelBackend was deployed
+        self.client.force_login(self.tech, backend="django.contrib.auth.backends.ModelBackend")
+        response = self.client.get(reverse("ticket_list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["user"], self.tech)
+
+    def test_cached_user_carries_role(self):
+        self.backend.get_user(self.tech.pk)
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.tech.pk)
+            self.assertTrue(user_has_role(user, RoleName.TECHNICIAN))
+
+    def test_role_and_password_changes_invalidate(self):
+        self.backend.get_user(self.tech.pk)
+
+        UserRole.objects.filter(user=self.tech).get().delete()
+        UserRole.objects.create(user=self.tech, role=self.role_admin)
+        self.assertTrue(user_has_role(self.backend.get_user(self.tech.pk), RoleName.ADMIN))
+
+        self.tech.set_password("changed")
+        self.tech.save()
+        self.assertTrue(self.backend.get_user(self.tech.pk).check_password("changed"))
+
+    def test_purge_sessions_removes_only_expired(self):
+        now = timezone.now()
+        for i in range(5):
+            Session.objects.create(session_key=f"old{i}", session_data="", expire_date=now - timedelta(days=1))
+        Session.objects.create(session_key="live", session_data="", expire_date=now + timedelta(days=1))
+
+        call_command("purge_sessions", "--batch-size", "2", "--sleep", "0", stdout=StringIO())
+        self.assertEqual(list(Session.objects.values_list("session_key", flat=True)), ["live"])
+
+
+class PurgeTicketsTests(TicketFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.media.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.old_closed = self._ticket(TicketStatus.CLOSED, days_old=400)
+        self.old_open = self._ticket(TicketStatus.OPEN, days_old=400)
+        self.recent_closed = self._ticket(TicketStatus.CLOSED, days_old=10)
+
+        self.old_closed.add_comment(self.rep, "done")
+        StatusHistory.objects.create(ticket=self.old_closed, to_status=TicketStatus.CLOSED, changed_by=self.rep)
+        self.attachment = Attachment.objects.create(
+            ticket=self.old_closed, uploader=self.rep, file=SimpleUploadedFile("log.txt", b"data")
+        )
+        # add_comment bumps updated_at; push it back out of retention
+        Ticket.objects.filter(pk=self.old_closed.pk).update(updated_at=timezone.now() - timedelta(days=400))
+
+        self.checkpoint = f"{self.media.name}/checkpoint.json"
+
+    def _ticket(self, status, days_old):
+        t = self._new_ticket(status=status)
+        Ticket.objects.filter(pk=t.pk).update(updated_at=timezone.now() - timedelta(days=days_old))
+        return t
+
+    def _purge(self, *extra):
+        out = StringIO()
+        call_command(
+            "purge_tickets", "--days", "365", "--sleep", "0", "--checkpoint", self.checkpoint, *extra, stdout=out
+        )
+        return out.getvalue()
+
+    def test_dry_run_only_reports(self):
+        output = self._purge("--dry-run")
+        self.assertIn("Would delete 1 tickets", output)
+        self.assertIn("Would delete 1 attachments", output)
+        self.assertEqual(Ticket.objects.count(), 3)
+
+    def test_purges_old_closed_tickets_and_files(self):
+        path = self.attachment.file.path
+        self._purge("--batch-size", "1")
+
+        self.assertEqual(
+            set(Ticket.objects.values_list("id", flat=True)), {self.old_open.id, self.recent_closed.id}
+        )
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(StatusHistory.objects.exists())
+        self.assertFalse(Attachment.objects.exists())
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resume_unlinks_pending_files_and_keeps_cutoff(self):
+        orphan = self.attachment.file.path
+        survivor = Attachment.objects.create(
+            ticket=self.old_open, uploader=self.rep, file=SimpleUploadedFile("keep.txt", b"data")
+        )
+        # orphan's row was deleted before the crash; survivor's delete was rolled back
+        orphan_name = self.attachment.file.name
+        self.attachment.delete()
+
+        cutoff = (timezone.now() - timedelta(days=500)).isoformat()
+        with open(self.checkpoint, "w") as f:
+            json.dump(
+                {"cutoff": cutoff, "last_id": 0, "pending_files": [orphan_name, survivor.file.name], "deleted": {}}, f
+            )
+
+        self._purge()
+
+        # the checkpoint's older cutoff wins, so the 400-day-old ticket survives this run
+        self.assertTrue(Ticket.objects.filter(pk=self.old_closed.pk).exists())
+        self.assertFalse(os.path.exists(orphan))
+        self.assertTrue(os.path.exists(survivor.file.path))
+
+    def test_crash_after_commit_leaves_files_in_checkpoint(self):
+        path = self.attachment.file.path
+
+        class CrashingPool(ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                raise RuntimeError("crash after commit")
+
+        with mock.patch("tickets.management.commands.purge_tickets.ThreadPoolExecutor", CrashingPool):
+            with self.assertRaises(RuntimeError):
+                self._purge()
+
+        self.assertFalse(Ticket.objects.filter(pk=self.old_closed.pk).exists())
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f)["pending_files"], [self.attachment.file.name])
+        self.assertTrue(os.path.exists(path))
+
+        self._purge()
+        self.assertFalse(os.path.exists(path))
+
+
+class RateLimiterTests(TestCase):
+    def test_user_and_global_buckets(self):
+        limiter = RateLimiter(user_rate=0, user_burst=2, global_rate=0, global_burst=3)
+
+        self.assertEqual([limiter.allow(1) for _ in range(3)], [True, True, False])
+        self.assertTrue(limiter.allow(2))
+        # global bucket is now empty; the rejected user keeps their token
+        self.assertFalse(limiter.allow(3))
+        self.assertEqual(limiter.user_buckets[3].tokens, 2)
+
+    def test_timed_out_ticket_is_cancelled_not_written(self):
+        ingestor = Ingestor({**DEFAULT_INGEST, "TIMEOUT": 0.01})
+        ticket = Ticket(title="late")
+
+        # writer thread never runs, so the item stays queued past the timeout
+        with mock.patch.object(ingestor.writer, "_ensure_started"):
+            with self.assertRaises(IngestTimeout):
+                ingestor.create(ticket, None)
+
+        self.assertEqual(ingestor.writer._claim([ingestor.writer.queue.get_nowait()]), [])
+
+    def test_wait_after_failed_cancel_is_bounded(self):
+        ingestor = Ingestor({**DEFAULT_INGEST, "TIMEOUT": 0.01})
+        # claimed by the writer (so it can't be cancelled) but never finished
+        stuck = Future()
+        stuck.set_running_or_notify_cancel()
+
+        with mock.patch.object(ingestor.writer, "submit", return_value=stuck):
+            with self.assertRaises(IngestTimeout) as ctx:
+                ingestor.create(Ticket(title="stuck"), None)
+        self.assertFalse(ctx.exception.withdrawn)
+
+
+@override_settings(TICKET_INGEST={"ENABLED": True, "USER_RATE": 0, "USER_BURST": 2})
+class TicketIngestTests(TicketFixtureMixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.rep)
+
+    def _create(self, title):
+        return self.client.post(
+            reverse("ticket_create"),
+            {"title": title, "description": "B", "category": self.cat.id, "priority": self.pri.id},
+        )
+
+    def test_group_commit_returns_ticket_and_rate_limits(self):
+        first = self._create("one")
+        ticket = Ticket.objects.get(title="one")
+        self.assertRedirects(first, reverse("ticket_detail", args=[ticket.id]), fetch_redirect_response=False)
+        self.assertEqual(ticket.status, TicketStatus.NEW)
+        self.assertTrue(StatusHistory.objects.filter(ticket=ticket, to_status=TicketStatus.NEW).exists())
+
+        self._create("two")
+        self.assertEqual(self._create("three").status_code, 429)
+        self.assertFalse(Ticket.objects.filter(title="three").exists())
+
+    def test_good_ticket_in_failed_batch_still_resolves(self):
+        writer = Ingestor({**DEFAULT_INGEST, "TIMEOUT": 5}).writer
+        good = Ticket(title="good", description="B", category=self.cat, priority=self.pri, reporter=self.rep)
+        bad = Ticket(title=None, description="B", category=self.cat, priority=self.pri, reporter=self.rep)
+
+        # queue both before the writer starts, so they are flushed as one batch
+        with mock.patch.object(writer, "_ensure_started"):
+            bad_future = writer.submit(bad, self.rep)
+            good_future = writer.submit(good, self.rep)
+        writer._ensure_started()
+
+        self.assertEqual(good_future.result(timeout=5).title, "good")
+        self.assertIsInstance(bad_future.exception(timeout=5), IntegrityError)
+        self.assertEqual(list(Ticket.objects.values_list("title", flat=True)), ["good"])
+        self.assertEqual(StatusHistory.objects.get().ticket_id, good.id)
+
+    def test_timeout_shows_error_instead_of_500(self):
+        with mock.patch.object(Ingestor, "create", side_effect=IngestTimeout("slow")):
+            response = self._create("slow")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertContains(response, "was not created", status_code=503)
@@ -8,4 +8,5 @@ urlpatterns = [
     path("tickets/create/", views.ticket_create, name="ticket_create"),
     path("tickets/<int:ticket_id>/", views.ticket_detail, name="ticket_detail"),
     path("tickets/<int:ticket_id>/assign/", views.ticket_assign_technician, name="ticket_assign"),
+    path("tickets/<int:ticket_id>/comments/", views.ticket_comments, name="ticket_comments"),
 ]
\ No newline at end of file
@@ -1,3 +1,6 @@
+import base64
+from datetime import datetime
+
 from django.shortcuts import render
 
 # Create your views here.
@@ -7,11 +10,15 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import PermissionDenied
 from django.db import transaction
 from django.db.models import Q
+from django.http import HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.views.decorators.http import require_http_methods
 
-from .forms import TicketCreateForm, AssignTechnicianForm
+from .forms import TicketCreateForm, AssignTechnicianForm, CommentForm
 from .models import (
     Ticket,
+    Comment,
     StatusHistory,
     TicketStatus,
     RoleName,
@@ -19,9 +26,13 @@ from .models import (
     Category,
     Priority,
 )
+from .ingest import IngestTimeout, get_ingestor
+from .workflow import get_workflow
 
 User = get_user_model()
 
+COMMENTS_PAGE_SIZE = 50
+
 
 @login_required
 def ticket_list(request):
@@ -79,18 +90,38 @@ def ticket_create(request):
     if request.method == "POST":
         form = TicketCreateForm(request.POST)
         if form.is_valid():
-            with transaction.atomic():
-                ticket: Ticket = form.save(commit=False)
+            ingestor = get_ingestor()
+
+            if ingestor is None:
+                with transaction.atomic():
+                    ticket: Ticket = form.save(commit=False)
+                    ticket.reporter = request.user
+                    ticket.initialise_status(request.user, TicketStatus.NEW)
+                    ticket.save()
+
+                    StatusHistory.objects.create(
+                        ticket=ticket,
+                        from_status=None,
+                        to_status=TicketStatus.NEW,
+                        changed_by=request.user,
+                    )
+            else:
+                # Ingestion mode: rate limit, then hand off to the group-commit writer
+                if not ingestor.limiter.allow(request.user.pk):
+                    messages.error(request, "Too many tickets are being submitted right now. Please try again shortly.")
+                    return render(request, "tickets/ticket_create.html", {"form": form}, status=429)
+
+                ticket = form.save(commit=False)
                 ticket.reporter = request.user
                 ticket.initialise_status(request.user, TicketStatus.NEW)
-                ticket.save()
-
-                StatusHistory.objects.create(
-                    ticket=ticket,
-                    from_status=None,
-                    to_status=TicketStatus.NEW,
-                    changed_by=request.user,
-                )
+                try:
+                    ticket = ingestor.create(ticket, request.user)
+                except IngestTimeout as e:
+                    if e.withdrawn:
+                        messages.error(request, "Your ticket could not be saved in time and was not created. Please submit it again.")
+                    else:
+                        messages.error(request, "Your ticket is taking longer than usual to save. Check your tickets before submitting it again.")
+                    return render(request, "tickets/ticket_create.html", {"form": form}, status=503)
 
             messages.success(request, f"Ticket created (#{ticket.id}).")
             return redirect("ticket_detail", ticket_id=ticket.id)
@@ -102,9 +133,114 @@ def ticket_create(request):
 
 @login_required
 def ticket_detail(request, ticket_id: int):
-    ticket = get_object_or_404(Ticket, pk=ticket_id)
+    # reporter/assignee come in via the ticket's JOIN, so auth_user is never queried on its own
+    ticket = get_object_or_404(
+        Ticket.objects.select_related("reporter", "assignee", "category", "priority"), pk=ticket_id
+    )
     is_admin = request.user.is_superuser or user_has_role(request.user, RoleName.ADMIN)
-    return render(request, "tickets/ticket_detail.html", {"ticket": ticket, "is_admin": is_admin})
+
+    # First page of the thread renders server-side; later pages load via ticket_comments
+    comments, next_cursor = _comment_page(ticket)
+
+    context = {
+        "ticket": ticket,
+        "is_admin": is_admin,
+        "can_assign": is_admin and get_workflow().can_assign(ticket.status),
+        "comments": comments,
+        "next_cursor": next_cursor,
+        "comment_form": CommentForm(),
+    }
+    return render(request, "tickets/ticket_detail.html", context)
+
+
+def _encode_cursor(comment: Comment) -> str:
+    raw = f"{comment.created_at.isoformat()}|{comment.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    """
+    Returns (created_at, id) or raises ValueError for a malformed cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, comment_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(comment_id)
+    except (UnicodeError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _comment_page(ticket: Ticket, cursor: str = "", limit: int | None = None):
+    """
+    Keyset pagination over (created_at, id), oldest first.
+    Uses the comment_thread_idx index, so page N costs the same as page 1.
+    Authors come in via a single JOIN rather than one query per comment.
+    """
+    # read at call time so the page size can be changed (and patched in tests)
+    limit = limit or COMMENTS_PAGE_SIZE
+    qs = (
+        Comment.objects.filter(ticket=ticket)
+        .select_related("author")
+        .only("id", "content", "created_at", "ticket_id", "author__id", "author__username")
+        .order_by("created_at", "id")
+    )
+
+    if cursor:
+        created_at, comment_id = _decode_cursor(cursor)
+        qs = qs.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=comment_id))
+
+    # Fetch one extra row to know whether another page exists (no COUNT needed)
+    comments = list(qs[: limit + 1])
+    next_cursor = ""
+    if len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = _encode_cursor(comments[-1])
+
+    return comments, next_cursor
+
+
+@login_required
+@require_http_methods(["GET", "POST"])
+def ticket_comments(request, ticket_id: int):
+    """
+    GET: one page of the comment thread after ?cursor=...
+         Returns JSON by default; ?format=html returns the rendered rows
+         as an HTML fragment (still alongside next_cursor).
+    POST: adds a comment, then redirects back to the ticket.
+    """
+    ticket = get_object_or_404(Ticket, pk=ticket_id)
+
+    if request.method == "POST":
+        form = CommentForm(request.POST)
+        if form.is_valid():
+            with transaction.atomic():
+                ticket.add_comment(request.user, form.cleaned_data["content"])
+            messages.success(request, "Comment added.")
+        else:
+            messages.error(request, "Comment cannot be empty.")
+        return redirect("ticket_detail", ticket_id=ticket.id)
+
+    try:
+        comments, next_cursor = _comment_page(ticket, request.GET.get("cursor", "").strip())
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    if request.GET.get("format") == "html":
+        html = render_to_string("tickets/_comment_items.html", {"comments": comments}, request=request)
+        return JsonResponse({"html": html, "next_cursor": next_cursor})
+
+    return JsonResponse({
+        "comments": [
+            {
+                "id": c.id,
+                "author": c.author.username,
+                "content": c.content,
+                "created_at": c.created_at.isoformat(),
+            }
+            for c in comments
+        ],
+        "next_cursor": next_cursor,
+    })
 
 
 @login_required
@@ -132,44 +268,41 @@ def ticket_assign_technician(request, ticket_id: int):
         if form.is_valid():
             technician = form.cleaned_data["technician"]
 
-            # Allow (re)assignment only when NEW or OPEN
-            if ticket.status not in (TicketStatus.NEW, TicketStatus.OPEN):
+            # Allow (re)assignment only in the workflow's assignable statuses (NEW or OPEN by default)
+            if not get_workflow().can_assign(ticket.status):
                 messages.error(
                     request,
                     f"Cannot (re)assign technician while ticket is '{ticket.status}'."
                 )
                 return redirect("ticket_detail", ticket_id=ticket.id)
 
-            try:
-                with transaction.atomic():
-                    from_status = ticket.status
-
-                    # Always assign/reassign technician
-                    ticket.assign_technician(technician, request.user)
+            # Tracks whether the winning attempt opened the ticket (mutate may run more than once)
+            outcome = {}
 
-                    # Only transition NEW -> OPEN (and write StatusHistory) on first assignment
-                    if ticket.status == TicketStatus.NEW:
-                        ticket.change_status(TicketStatus.OPEN, request.user)
+            def assign(t: Ticket) -> None:
+                # Always assign/reassign technician
+                t.assign_technician(technician, request.user)
 
-                        StatusHistory.objects.create(
-                            ticket=ticket,
-                            from_status=from_status,
-                            to_status=TicketStatus.OPEN,
-                            changed_by=request.user,
-                        )
+                # Only transition NEW -> OPEN (and write StatusHistory) on first assignment
+                outcome["opened"] = t.status == TicketStatus.NEW
+                if outcome["opened"]:
+                    t.change_status(TicketStatus.OPEN, request.user)
 
-                        messages.success(request, f"Assigned {technician.username} and set status to Open.")
-                    else:
-                        # Already OPEN — reassignment only (no status change, no StatusHistory)
-                        messages.success(request, f"Reassigned ticket to {technician.username}.")
-
-                    ticket.save()
-
-                return redirect("ticket_detail", ticket_id=ticket.id)
+            try:
+                # Compare-and-swap on Ticket.version; re-reads and retries if another admin got there first
+                Ticket.update_with_retry(ticket.id, assign, request.user)
 
             except Exception as e:
                 messages.error(request, f"Assign failed: {e}")
                 return redirect("ticket_detail", ticket_id=ticket.id)
+
+            if outcome["opened"]:
+                messages.success(request, f"Assigned {technician.username} and set status to Open.")
+            else:
+                # Already OPEN — reassignment only (no status change, no StatusHistory)
+                messages.success(request, f"Reassigned ticket to {technician.username}.")
+
+            return redirect("ticket_detail", ticket_id=ticket.id)
     else:
         form = AssignTechnicianForm(tech_qs=tech_qs)
 
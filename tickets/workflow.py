@@ -0,0 +1,154 @@
+"""
+Ticket workflow engine.
+
+The transition table comes from settings.TICKET_WORKFLOW (falling back to
+DEFAULT_WORKFLOW below) and is compiled once into an integer-indexed
+adjacency matrix over TicketStatus. Status codes are the positions in
+TicketStatus.values, the same codes the analytics snapshot uses.
+
+settings.TICKET_WORKFLOW format:
+    {
+        "transitions": {"New": ["Open"], "Open": ["In Progress", "Closed"], ...},
+        "assignable": ["New", "Open"],   # statuses where a technician can be (re)assigned
+    }
+"""
+
+from __future__ import annotations
+
+from numbers import Integral
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .models import TicketStatus
+
+# Optional dependency: batch validation is vectorised when NumPy is available
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DEFAULT_WORKFLOW = {
+    "transitions": {
+        TicketStatus.NEW: [TicketStatus.OPEN],
+        TicketStatus.OPEN: [TicketStatus.IN_PROGRESS, TicketStatus.CLOSED],
+        TicketStatus.IN_PROGRESS: [TicketStatus.RESOLVED],
+        TicketStatus.RESOLVED: [TicketStatus.CLOSED, TicketStatus.REOPENED],
+        TicketStatus.CLOSED: [TicketStatus.REOPENED],
+        TicketStatus.REOPENED: [TicketStatus.IN_PROGRESS, TicketStatus.RESOLVED],
+    },
+    "assignable": [TicketStatus.NEW, TicketStatus.OPEN],
+}
+
+
+class Workflow:
+    """
+    Compiled transition table. Build via get_workflow() rather than directly,
+    so the compiled matrix is shared.
+    """
+
+    def __init__(self, config: dict):
+        self.statuses = tuple(TicketStatus.values)
+        self.index = {status: code for code, status in enumerate(self.statuses)}
+        n = len(self.statuses)
+
+        # Row-major n x n flags: _flat[from * n + to]; used for scalar checks
+        self._flat = bytearray(n * n)
+        for from_status, targets in config.get("transitions", {}).items():
+            for to_status in targets:
+                self._flat[self._code(from_status) * n + self._code(to_status)] = 1
+
+        self._assignable = frozenset(self._code(s) for s in config.get("assignable", ()))
+
+        self._targets = tuple(
+            tuple(self.statuses[j] for j in range(n) if self._flat[i * n + j])
+            for i in range(n)
+        )
+        self._matrix = np.frombuffer(bytes(self._flat), dtype=np.bool_).reshape(n, n) if np is not None else None
+
+    def _code(self, status: str) -> int:
+        try:
+            return self.index[status]
+        except KeyError:
+            raise ImproperlyConfigured(f"TICKET_WORKFLOW refers to unknown status {status!r}.")
+
+    def _lookup(self, status):
+        """
+        Code for a status string or an integer code; None if unknown.
+        """
+        code = self.index.get(status)
+        # strings are the common case; only fall back to the (slower) ABC check for misses
+        if code is None and isinstance(status, Integral) and 0 <= status < len(self.statuses):
+            code = int(status)
+        return code
+
+    # ---------- single ticket ----------
+
+    def can_transition(self, from_status, to_status) -> bool:
+        i = self._lookup(from_status)
+        j = self._lookup(to_status)
+        if i is None or j is None:
+            return False
+        return bool(self._flat[i * len(self.statuses) + j])
+
+    def allowed_targets(self, from_status) -> tuple:
+        i = self._lookup(from_status)
+        return () if i is None else self._targets[i]
+
+    def can_assign(self, status) -> bool:
+        return self._lookup(status) in self._assignable
+
+    # ---------- batches ----------
+
+    def encode(self, statuses):
+        """
+        Maps status strings or integer codes to codes (-1 for unknown).
+        Integer NumPy arrays pass through untouched.
+        """
+        if np is not None and isinstance(statuses, np.ndarray) and statuses.dtype.kind in "iu":
+            return statuses
+        codes = [self._lookup(s) for s in statuses]
+        codes = [-1 if c is None else c for c in codes]
+        return np.array(codes, dtype=np.intp) if np is not None else codes
+
+    def validate_many(self, from_statuses, to_statuses):
+        """
+        Validates (from, to) pairs in one step. Accepts status strings or
+        integer codes (lists or arrays). Returns a bool array (or list without NumPy).
+        """
+        from_codes = self.encode(from_statuses)
+        to_codes = self.encode(to_statuses)
+        n = len(self.statuses)
+
+        if np is None:
+            # encode() already mapped anything out of range to -1
+            return [
+                f >= 0 and t >= 0 and bool(self._flat[f * n + t])
+                for f, t in zip(from_codes, to_codes)
+            ]
+
+        from_codes = np.asarray(from_codes)
+        to_codes = np.asarray(to_codes)
+        known = (from_codes >= 0) & (from_codes < n) & (to_codes >= 0) & (to_codes < n)
+        # clip so unknown codes still index safely; the mask zeroes them out
+        allowed = self._matrix[np.clip(from_codes, 0, n - 1), np.clip(to_codes, 0, n - 1)]
+        return allowed & known
+
+
+_compiled: Workflow | None = None
+
+
+def get_workflow() -> Workflow:
+    global _compiled
+    if _compiled is None:
+        _compiled = Workflow(getattr(settings, "TICKET_WORKFLOW", DEFAULT_WORKFLOW))
+    return _compiled
+
+
+def reset_workflow() -> None:
+    """
+    Drops the compiled workflow; the next get_workflow() recompiles it.
+    """
+    global _compiled
+    _compiled = None